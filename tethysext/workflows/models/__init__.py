@@ -6,5 +6,5 @@ from .workflow_step import Step
 from .guid import GUID
 from .workflow import TethysWorkflow 
 
-__all__ = [WorkflowsBase, ControllerMetadata, Result, Step, 
-           GUID, TethysWorkflow, step_result_association, step_parent_child_association]
\ No newline at end of file
+__all__ = ['WorkflowsBase', 'ControllerMetadata', 'Result', 'Step',
+           'GUID', 'TethysWorkflow', 'step_result_association', 'step_parent_child_association']
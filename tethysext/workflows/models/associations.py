@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Table, ForeignKey
+from sqlalchemy import Column, Table, ForeignKey
 from .guid import GUID
 
 from .base import WorkflowsBase
@@ -6,15 +6,13 @@ from .base import WorkflowsBase
 step_result_association = Table(
     'step_result_association',
     WorkflowsBase.metadata,
-    Column('id', Integer, primary_key=True),
-    Column('workflow_step_id', GUID, ForeignKey('workflow_steps.id')),
-    Column('workflow_results_id', GUID, ForeignKey('workflow_results.id'))
+    Column('workflow_step_id', GUID, ForeignKey('workflow_steps.id'), primary_key=True),
+    Column('workflow_results_id', GUID, ForeignKey('workflow_results.id'), primary_key=True, index=True)
 )
 
 step_parent_child_association = Table(
     'step_parent_child_association',
     WorkflowsBase.metadata,
-    Column('id', Integer, primary_key=True),
-    Column('child_id', GUID, ForeignKey('workflow_steps.id')),
-    Column('parent_id', GUID, ForeignKey('workflow_steps.id'))
+    Column('child_id', GUID, ForeignKey('workflow_steps.id'), primary_key=True),
+    Column('parent_id', GUID, ForeignKey('workflow_steps.id'), primary_key=True, index=True)
 )
@@ -9,7 +9,7 @@
 import uuid
 
 from sqlalchemy import Column, ForeignKey
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from ...models import WorkflowsBase, GUID
@@ -19,8 +19,8 @@ class FileCollection(WorkflowsBase):
     """A model representing a FileCollection"""
     __tablename__ = "file_collections"
 
-    id = Column('id', GUID, primary_key=True, default=uuid.uuid4)
-    file_database_id = Column('file_database_id', GUID, ForeignKey('file_databases.id'))
-    meta = Column('metadata', JSON)
+    id = Column(GUID, primary_key=True, default=uuid.uuid4)
+    file_database_id = Column(GUID, ForeignKey('file_databases.id'))
+    meta = Column('metadata', JSONB)
 
     database = relationship("FileDatabase", back_populates="collections")
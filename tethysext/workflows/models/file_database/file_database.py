@@ -9,7 +9,7 @@
 import uuid
 
 from sqlalchemy import Column
-from sqlalchemy.dialects.postgresql import JSON
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 
 from ...models import WorkflowsBase, GUID
@@ -19,7 +19,7 @@ class FileDatabase(WorkflowsBase):
     """A model representing a FileDatabase"""
     __tablename__ = "file_databases"
 
-    id = Column('id', GUID, primary_key=True, default=uuid.uuid4)
-    meta = Column('metadata', JSON)
+    id = Column(GUID, primary_key=True, default=uuid.uuid4)
+    meta = Column('metadata', JSONB)
 
     collections = relationship("FileCollection", back_populates="database")
@@ -11,7 +11,7 @@ class GUID(TypeDecorator):
     CHAR(32), storing as stringified hex values.
     """
     impl = CHAR
-    cache_ok = False
+    cache_ok = True
 
     def load_dialect_impl(self, dialect):
         if dialect.name == 'postgresql':
@@ -32,7 +32,7 @@ class GUID(TypeDecorator):
                 return "%.32x" % int(value)
 
     def process_result_value(self, value, dialect):
-        if value is None:
+        if value is None or isinstance(value, uuid.UUID):
             return value
         else:
             return uuid.UUID(value)
@@ -12,22 +12,41 @@ import logging
 
 import datetime as dt
 from abc import abstractmethod
+from functools import lru_cache
+from itertools import islice
 
 from django.shortcuts import reverse
 from sqlalchemy import Column, ForeignKey, String, DateTime, Boolean, Integer
-from sqlalchemy.orm import relationship, backref
+from sqlalchemy.orm import relationship
 from .guid import GUID
 
 from ..mixins import AttributesMixin, ResultsMixin
 from .base import WorkflowsBase
 from .workflow_step import Step
 from ..steps import FormInputStep, ResultsStep
+from ..utilities import import_from_string
 
 
 log = logging.getLogger(f'tethys.{__name__}')
 __all__ = ['TethysWorkflow']
 
 
+@lru_cache(maxsize=None)
+def _import_param_class(path):
+    """
+    Import the param class referenced by the given dot-path, caching the result.
+    """
+    return import_from_string(path)
+
+
+@lru_cache(maxsize=4096)
+def _prettify(key):
+    """
+    Convert a parameter name into a display label (e.g. "max_depth" -> "Max Depth").
+    """
+    return key.replace('_', ' ').title()
+
+
 class TethysWorkflow(WorkflowsBase, AttributesMixin, ResultsMixin):
     """
     Data model for storing information about workflows.
@@ -69,6 +88,8 @@ class TethysWorkflow(WorkflowsBase, AttributesMixin, ResultsMixin):
 
     COMPLETE_STATUSES = Step.COMPLETE_STATUSES
 
+    _REPR_PREFIX = '<TethysWorkflow'
+
     id = Column(GUID, primary_key=True, default=uuid.uuid4)
     creator_id = Column(Integer)
     creator_name = Column(String)
@@ -79,9 +100,9 @@ class TethysWorkflow(WorkflowsBase, AttributesMixin, ResultsMixin):
     _attributes = Column(String)
     description = Column(String, nullable=True)
 
-    steps = relationship('Step', order_by='Step.order', backref='workflow',
-                         cascade='all,delete')
-    results = relationship('Result', order_by='Result.order', backref='workflow',
+    steps = relationship('Step', order_by='Step.order', back_populates='workflow',
+                         cascade='all,delete', lazy='selectin')
+    results = relationship('Result', order_by='Result.order', back_populates='workflow',
                            cascade='all,delete')
 
     __mapper_args__ = {
@@ -89,8 +110,12 @@ class TethysWorkflow(WorkflowsBase, AttributesMixin, ResultsMixin):
         'polymorphic_identity': TYPE
     }
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._REPR_PREFIX = f'<{cls.__name__}'
+
     def __repr__(self):
-        return f'<{self.__class__.__name__} name="{self.name}" id="{self.id}"'
+        return f'{self._REPR_PREFIX} name="{self.name}" id="{self.id}" >'
 
     @property
     def complete(self):
@@ -144,6 +169,25 @@ class TethysWorkflow(WorkflowsBase, AttributesMixin, ResultsMixin):
             if step.name == name:
                 return step
 
+    def _step_index(self, step, steps=None):
+        """
+        Get the index of the given step in this workflow.
+
+        Args:
+            step(Step): A step belonging to this workflow.
+            steps(list<Step>): The steps of this workflow, if already retrieved. Optional.
+
+        Returns:
+            int: the index of the step.
+        """
+        if steps is None:
+            steps = self.steps
+
+        try:
+            return steps.index(step)
+        except ValueError:
+            raise ValueError('Step {} does not belong to this workflow.'.format(step)) from None
+
     def get_adjacent_steps(self, step):
         """
         Get the adjacent steps to the given step.
@@ -154,14 +198,12 @@ class TethysWorkflow(WorkflowsBase, AttributesMixin, ResultsMixin):
         Returns:
             Step, Step: previous and next steps, respectively.
         """
-        if step not in self.steps:
-            raise ValueError('Step {} does not belong to this workflow.'.format(step))
-
-        index = self.steps.index(step)
+        steps = self.steps
+        index = self._step_index(step, steps)
         previous_index = index - 1
         next_index = index + 1
-        previous_step = self.steps[previous_index] if previous_index >= 0 else None
-        next_step = self.steps[next_index] if next_index < len(self.steps) else None
+        previous_step = steps[previous_index] if previous_index >= 0 else None
+        next_step = steps[next_index] if next_index < len(steps) else None
 
         return previous_step, next_step
 
@@ -175,11 +217,9 @@ class TethysWorkflow(WorkflowsBase, AttributesMixin, ResultsMixin):
         Returns:
             list<Step>: a list of steps previous to this one.
         """
-        if step not in self.steps:
-            raise ValueError('Step {} does not belong to this workflow.'.format(step))
-
-        step_index = self.steps.index(step)
-        previous_steps = self.steps[:step_index]
+        steps = self.steps
+        step_index = self._step_index(step, steps)
+        previous_steps = steps[:step_index]
         return previous_steps
 
     def get_tabular_data_for_previous_steps(self, step, request, session):
@@ -194,13 +234,12 @@ class TethysWorkflow(WorkflowsBase, AttributesMixin, ResultsMixin):
         Returns:
             dict: a dictionary with tabular data per step.
         """
-        if step not in self.steps:
-            raise ValueError('Step {} does not belong to this workflow.'.format(step))
-
-        previous_steps = self.get_previous_steps(step)
+        steps = self.steps
+        previous_steps = islice(steps, self._step_index(step, steps))
         steps_to_skip = set()
         mappable_tabular_step_types = (FormInputStep,)
         step_data = {}
+        param_class_instances = {}
         for step in previous_steps:
             # skip non form steps
             if step in steps_to_skip or not isinstance(step, mappable_tabular_step_types):
@@ -208,11 +247,12 @@ class TethysWorkflow(WorkflowsBase, AttributesMixin, ResultsMixin):
 
             # Rebuild the param if param_class is in options
             step_param_class = ''
-            if 'param_class' in step.options:
-                package, p_class = step.options['param_class'].rsplit('.', 1)
-                mod = __import__(package, fromlist=[p_class])
-                ParamClass = getattr(mod, p_class)
-                step_param_class = ParamClass(request=request, session=session)
+            param_class_path = step.options.get('param_class')
+            if param_class_path:
+                ParamClass = _import_param_class(param_class_path)
+                if ParamClass not in param_class_instances:
+                    param_class_instances[ParamClass] = ParamClass(request=request, session=session)
+                step_param_class = param_class_instances[ParamClass]
             step_params = step.get_parameter('form-values')
             fixed_params = dict()
             for key, value in step_params.items():
@@ -220,8 +260,9 @@ class TethysWorkflow(WorkflowsBase, AttributesMixin, ResultsMixin):
                 look_up_dictionary = dict()
                 # Check ParamClass is  initialize and if the param is an Object Selector.
                 try:
-                    if step_param_class and isinstance(step_param_class.param[key], param.ObjectSelector):
-                        look_up_dictionary = step_param_class.param[key].names
+                    step_param = step_param_class.param[key] if step_param_class else None
+                    if isinstance(step_param, param.ObjectSelector):
+                        look_up_dictionary = step_param.names
                 except KeyError:
                     pass
                 # if the names is defined, it will return all the options as a dictionary for a given param.
@@ -230,7 +271,7 @@ class TethysWorkflow(WorkflowsBase, AttributesMixin, ResultsMixin):
                     step_value = self.get_key_from_value(look_up_dictionary, value)
                 else:
                     step_value = value
-                step_name = key.replace('_', ' ').title()
+                step_name = _prettify(key)
                 fixed_params[step_name] = step_value
             step_data[step.name] = fixed_params
 
@@ -245,11 +286,9 @@ class TethysWorkflow(WorkflowsBase, AttributesMixin, ResultsMixin):
         Returns:
             list<Step>: a list of steps following this one.
         """
-        if step not in self.steps:
-            raise ValueError('Step {} does not belong to this workflow.'.format(step))
-
-        step_index = self.steps.index(step)
-        next_steps = self.steps[step_index + 1:]
+        steps = self.steps
+        step_index = self._step_index(step, steps)
+        next_steps = steps[step_index + 1:]
         return next_steps
 
     def reset_next_steps(self, step, include_current=False):
@@ -259,10 +298,8 @@ class TethysWorkflow(WorkflowsBase, AttributesMixin, ResultsMixin):
             step(Step): A step belonging to this workflow.
             include_current(bool): Reset current step
         """
-        if step not in self.steps:
-            raise ValueError('Step {} does not belong to this workflow.'.format(step))
-
-        next_steps = self.get_next_steps(step)
+        steps = self.steps
+        next_steps = islice(steps, self._step_index(step, steps) + 1, None)
 
         for s in next_steps:
             # Only reset if the step is not in pending status
@@ -293,4 +330,8 @@ class TethysWorkflow(WorkflowsBase, AttributesMixin, ResultsMixin):
         value: value to look up
         :return: key associated with the value
         """
-        return list(dict_object.keys())[list(dict_object.values()).index(value)]
+        for key, dict_value in dict_object.items():
+            if dict_value == value:
+                return key
+
+        raise ValueError('{} is not in dict_object.'.format(value))
@@ -7,9 +7,10 @@
 ********************************************************************************
 """
 import uuid
-from sqlalchemy.orm import Session
+import operator
 from sqlalchemy.orm import relationship, backref
-from sqlalchemy import Column, ForeignKey, String, PickleType, Integer
+from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy import Column, ForeignKey, Index, String, PickleType, Integer
 from .guid import GUID
 from ..mixins import StatusMixin, AttributesMixin, OptionsMixin
 from .base import WorkflowsBase
@@ -24,6 +25,9 @@ class Result(WorkflowsBase, StatusMixin, AttributesMixin, OptionsMixin):
     Data model for storing information about workflow results.
     """
     __tablename__ = 'workflow_results'
+    __table_args__ = (
+        Index('ix_workflow_results_workflow_id_order', 'workflow_id', 'order'),
+    )
     CONTROLLER = 'tethysext.workflows.controllers.workflows.workflow_results_view.WorkflowResultsView'
     TYPE = 'generic_workflow_result'
 
@@ -35,10 +39,13 @@ class Result(WorkflowsBase, StatusMixin, AttributesMixin, OptionsMixin):
     codename = Column(String)
     description = Column(String)
     order = Column(Integer)
-    _data = Column(PickleType, default={})
+    # Compare by identity: data may contain pandas/numpy objects that can't be compared with ==.
+    _data = Column(PickleType(comparator=operator.is_), default={})
     _options = Column(PickleType, default={})
     _attributes = Column(String)
 
+    workflow = relationship('TethysWorkflow', back_populates='results')
+
     _controller = relationship(
         'ControllerMetadata',
         backref=backref('result'),
@@ -80,14 +87,13 @@ class Result(WorkflowsBase, StatusMixin, AttributesMixin, OptionsMixin):
 
     @data.setter
     def data(self, value):
-        self._data = dict()
-        session = Session.object_session(self)
-        session and session.commit()
         self._data = value
-        session and session.commit()
+        # The identity comparator can't see in-place changes to the same object, always write it on flush
+        flag_modified(self, '_data')
 
     def reset(self):
         """
         Resets result to initial state.
         """
         self._data = dict()
+        flag_modified(self, '_data')
@@ -11,7 +11,7 @@ import uuid
 from abc import abstractmethod
 from copy import deepcopy
 
-from sqlalchemy import Column, ForeignKey, String, PickleType, Integer, Boolean
+from sqlalchemy import Column, ForeignKey, Index, String, PickleType, Integer, Boolean
 from sqlalchemy.orm import relationship, backref
 from .guid import GUID
 from ..mixins import StatusMixin, AttributesMixin, OptionsMixin
@@ -42,6 +42,9 @@ class Step(WorkflowsBase, StatusMixin, AttributesMixin, OptionsMixin):
     3c. STATUS_CHANGES_REQUESTED = Changes required and resubmit
     """  # noqa: E501
     __tablename__ = 'workflow_steps'
+    __table_args__ = (
+        Index('ix_workflow_steps_workflow_id_order', 'workflow_id', 'order'),
+    )
     CONTROLLER = ''
     TYPE = 'generic_workflow_step'
     ATTR_STATUS_MESSAGE = 'status_message'
@@ -64,6 +67,8 @@ class Step(WorkflowsBase, StatusMixin, AttributesMixin, OptionsMixin):
     _attributes = Column(String)
     _parameters = Column(PickleType, default={})
 
+    workflow = relationship('TethysWorkflow', back_populates='steps')
+
     _controller = relationship(
         'ControllerMetadata',
         backref='step',
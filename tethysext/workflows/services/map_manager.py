@@ -6,19 +6,75 @@
 * Copyright: (c) Aquaveo 2018
 ********************************************************************************
 """
-import copy
 import json
-from abc import ABCMeta, abstractmethod
+from abc import ABC, abstractmethod
 from tethys_gizmos.gizmo_options import MVView, MVLayer
 from .color_ramps import COLOR_RAMPS
-import collections
+import numpy as np
 
 
-class MapManagerBase(object):
+def _json_default(obj):
+    """
+    Fallback encoder for numpy values, sets, and dict views. Raises TypeError for anything else, like json.dumps.
+    """
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset, type({}.keys()), type({}.values()))):
+        return list(obj)
+    raise TypeError(f'Object of type {obj.__class__.__name__} is not JSON serializable')
+
+
+try:
+    import orjson
+
+    # Route datetimes and dataclasses to the default hook so output matches the json fallback
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def _dumps(obj):
+        return orjson.dumps(obj, default=_json_default, option=_ORJSON_OPTIONS).decode()
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, default=_json_default)
+
+
+# Marks cached values that have not been computed yet (None or [] are valid results)
+_UNSET = object()
+
+_VECTOR_STYLE_COLOR = 'gold'
+_VECTOR_STYLE_MAP = {
+    'Point': {'ol.style.Style': {
+        'image': {'ol.style.Circle': {
+            'radius': 5,
+            'fill': {'ol.style.Fill': {
+                'color': _VECTOR_STYLE_COLOR,
+            }},
+            'stroke': {'ol.style.Stroke': {
+                'color': _VECTOR_STYLE_COLOR,
+            }}
+        }}
+    }},
+    'LineString': {'ol.style.Style': {
+        'stroke': {'ol.style.Stroke': {
+            'color': _VECTOR_STYLE_COLOR,
+            'width': 2
+        }}
+    }},
+    'Polygon': {'ol.style.Style': {
+        'stroke': {'ol.style.Stroke': {
+            'color': _VECTOR_STYLE_COLOR,
+            'width': 2
+        }},
+        'fill': {'ol.style.Fill': {
+            'color': 'rgba(255, 215, 0, 0.1)'
+        }}
+    }},
+}
+
+
+class MapManagerBase(ABC):
     """
     Base class for object that orchestrates the map layers.
     """
-    __metaclass__ = ABCMeta
 
     MAX_ZOOM = 28
     MIN_ZOOM = 0
@@ -31,8 +87,9 @@ class MapManagerBase(object):
     LAYER_SOURCE_TYPE = 'TileWMS'
 
     COLOR_RAMPS = COLOR_RAMPS
+    # Shared by every tiled WMS layer; values are tuples so they can't be mutated in place
     DEFAULT_TILE_GRID = {
-        'resolutions': [
+        'resolutions': (
             156543.03390625,
             78271.516953125,
             39135.7584765625,
@@ -64,33 +121,38 @@ class MapManagerBase(object):
             0.0005831682455027,
             0.0002915841227514,
             0.0001457920613757
-        ],
-        'extent': [-20037508.34, -20037508.34, 20037508.34, 20037508.34],
-        'origin': [0.0, 0.0],
-        'tileSize': [256, 256]
+        ),
+        'extent': (-20037508.34, -20037508.34, 20037508.34, 20037508.34),
+        'origin': (0.0, 0.0),
+        'tileSize': (256, 256)
     }
 
-    _DEFAULT_POPUP_EXCLUDED_PROPERTIES = ['id', 'type', 'layer_name']
+    _DEFAULT_POPUP_EXCLUDED_PROPERTIES = ('id', 'type', 'layer_name')
+    _VECTORIZE_DIVISIONS_THRESHOLD = 32
 
     def __init__(self, spatial_manager):
         self.spatial_manager = spatial_manager
-        self._map_extent = None
-        self._default_view = None
+        self._map_extent = _UNSET
+        self._default_view = _UNSET
 
     @property
     def map_extent(self):
-        if not self._map_extent:
-            _, extent = self.get_map_extent()
-            self._map_extent = extent
+        if self._map_extent is _UNSET:
+            self._load_map_extent()
         return self._map_extent
 
     @property
     def default_view(self):
-        if not self._default_view:
-            view, _ = self.get_map_extent()
-            self._default_view = view
+        if self._default_view is _UNSET:
+            self._load_map_extent()
         return self._default_view
 
+    def _load_map_extent(self):
+        """
+        Populate both the default view and extent caches from a single call to get_map_extent.
+        """
+        self._default_view, self._map_extent = self.get_map_extent()
+
     @abstractmethod
     def compose_map(self, request, *args, **kwargs):
         """
@@ -121,15 +183,7 @@ class MapManagerBase(object):
         Returns:
             str: parameter string.
         """
-        if not kwargs:
-            return ''
-
-        joined_pairs = []
-        for k, v in kwargs.items():
-            joined_pairs.append(':'.join([k, str(v)]))
-
-        param_string = ';'.join(joined_pairs)
-        return param_string
+        return ';'.join(f'{k}:{v}' for k, v in kwargs.items())
 
     def build_geojson_layer(self, geojson, layer_name, layer_title, layer_variable, layer_id='', visible=True,
                             public=True, selectable=False, plottable=False, has_action=False, extent=None,
@@ -268,22 +322,24 @@ class MapManagerBase(object):
             MVLayer: the MVLayer object.
         """  # noqa: E501
         # Build params
-        params = {}
-        params['LAYERS'] = layer_name
-
-        if tiled:
-            params.update({
-                'TILED': True,
-                'TILESORIGIN': '0.0,0.0'
-            })
+        params = {'LAYERS': layer_name}
 
         if viewparams:
             params['VIEWPARAMS'] = viewparams
 
-        if env:
-            params['ENV'] = env
+        env_parts = [env] if env else []
+
+        if color_ramp_division_kwargs:
+            # Create color ramp and add them to ENV
+            color_ramp_divisions = self.generate_custom_color_ramp_divisions(**color_ramp_division_kwargs)
+            env_parts.append(self.build_param_string(**color_ramp_divisions))
+
+        if env_parts:
+            params['ENV'] = ';'.join(env_parts)
+
         if times:
-            times = json.dumps(times),
+            times = _dumps(times)
+
         # Build options
         options = {
             'url': endpoint,
@@ -291,20 +347,14 @@ class MapManagerBase(object):
             'serverType': 'geoserver',
             'crossOrigin': 'anonymous',
         }
-        if color_ramp_division_kwargs:
-            # Create color ramp and add them to ENV
-            color_ramp_divisions = self.generate_custom_color_ramp_divisions(**color_ramp_division_kwargs)
-            if 'ENV' in params.keys():
-                if params['ENV']:
-                    params['ENV'] += ";" + self.build_param_string(**color_ramp_divisions)
-                else:
-                    params['ENV'] = self.build_param_string(**color_ramp_divisions)
-            else:
-                params['ENV'] = self.build_param_string(**color_ramp_divisions)
-        layer_source = 'TileWMS' if tiled else 'ImageWMS'
 
         if tiled:
+            params['TILED'] = True
+            params['TILESORIGIN'] = '0.0,0.0'
             options['tileGrid'] = self.DEFAULT_TILE_GRID
+            layer_source = 'TileWMS'
+        else:
+            layer_source = 'ImageWMS'
 
         mv_layer = self._build_mv_layer(
             layer_id=layer_id,
@@ -417,32 +467,30 @@ class MapManagerBase(object):
         if not popup_title:
             popup_title = layer_title
 
-        data = {
-            'layer_id': str(layer_id) if layer_id else layer_name,
-            'layer_name': layer_name,
-            'popup_title': popup_title,
-            'layer_variable': layer_variable,
-            'toggle_status': public,
-        }
-
         # Process excluded properties
-        properties_to_exclude = copy.deepcopy(self._DEFAULT_POPUP_EXCLUDED_PROPERTIES)
+        properties_to_exclude = list(self._DEFAULT_POPUP_EXCLUDED_PROPERTIES)
 
         if plottable:
             properties_to_exclude.append('plot')
 
         if excluded_properties and isinstance(excluded_properties, (list, tuple)):
-            for ep in excluded_properties:
-                if ep not in properties_to_exclude:
-                    properties_to_exclude.append(ep)
+            # De-duplicate while preserving order
+            properties_to_exclude = list(dict.fromkeys([*properties_to_exclude, *excluded_properties]))
 
-        data.update({'excluded_properties': properties_to_exclude})
+        data = {
+            'layer_id': str(layer_id) if layer_id else layer_name,
+            'layer_name': layer_name,
+            'popup_title': popup_title,
+            'layer_variable': layer_variable,
+            'toggle_status': public,
+            'excluded_properties': properties_to_exclude,
+        }
 
         if plottable:
-            data.update({'plottable': plottable})
+            data['plottable'] = plottable
 
         if has_action:
-            data.update({'has_action': has_action})
+            data['has_action'] = has_action
 
         if not extent:
             extent = self.map_extent
@@ -451,10 +499,10 @@ class MapManagerBase(object):
         layer_options = {"visible": visible, "show_download": show_download}
 
         if style_map:
-            layer_options.update({'style_map': style_map})
+            layer_options['style_map'] = style_map
 
         if label_options:
-            layer_options.update({'label_options': label_options})
+            layer_options['label_options'] = label_options
 
         mv_layer = MVLayer(
             source=layer_source,
@@ -505,39 +553,9 @@ class MapManagerBase(object):
         Builds the style map for vector layers.
 
         Returns:
-            dict: the style map.
+            dict: the style map. Shared across calls, do not mutate.
         """
-        color = 'gold'
-        style_map = {
-            'Point': {'ol.style.Style': {
-                'image': {'ol.style.Circle': {
-                    'radius': 5,
-                    'fill': {'ol.style.Fill': {
-                        'color': color,
-                    }},
-                    'stroke': {'ol.style.Stroke': {
-                        'color': color,
-                    }}
-                }}
-            }},
-            'LineString': {'ol.style.Style': {
-                'stroke': {'ol.style.Stroke': {
-                    'color': color,
-                    'width': 2
-                }}
-            }},
-            'Polygon': {'ol.style.Style': {
-                'stroke': {'ol.style.Stroke': {
-                    'color': color,
-                    'width': 2
-                }},
-                'fill': {'ol.style.Fill': {
-                    'color': 'rgba(255, 215, 0, 0.1)'
-                }}
-            }},
-        }
-
-        return style_map
+        return _VECTOR_STYLE_MAP
 
     def get_wms_endpoint(self):
         """
@@ -566,6 +584,16 @@ class MapManagerBase(object):
 
         return view, extent
 
+    def _get_color_ramp_names(self):
+        """
+        Get the names of the available color ramps.
+
+        Returns:
+            tuple<str>: color ramp names.
+        """
+        # Built per call so ramps added to COLOR_RAMPS at runtime are included
+        return tuple(self.COLOR_RAMPS)
+
     def build_legend(self, layer, units=""):
         """
         Build Legend data for a given layer
@@ -595,7 +623,7 @@ class MapManagerBase(object):
                 'legend_id': legend_key,
                 'title': layer['layer_title'].replace("_", " "),
                 'divisions': dict(),
-                'color_list': self.COLOR_RAMPS.keys(),
+                'color_list': self._get_color_ramp_names(),
                 'layer_id': layer_id,
                 'min_value': min_value,
                 'max_value': max_value,
@@ -606,14 +634,13 @@ class MapManagerBase(object):
                 'units': units,
             }
 
-            divisions = self.generate_custom_color_ramp_divisions(**layer['color_ramp_division_kwargs'])
+            divisions = self.generate_custom_color_ramp_divisions(**div_kwargs)
+
+            num_divisions = div_kwargs.get('num_divisions', 10)
 
-            for label in divisions.keys():
-                if color_prefix in label and int(label.replace(color_prefix, '')) >= first_division:
-                    legend_info['divisions'][float(divisions[label.replace(color_prefix, prefix)])] = divisions[label]
-            legend_info['divisions'] = collections.OrderedDict(
-                sorted(legend_info['divisions'].items())
-            )
+            for i in range(first_division, first_division + num_divisions):
+                legend_info['divisions'][float(divisions[f'{prefix}{i}'])] = divisions[f'{color_prefix}{i}']
+            legend_info['divisions'] = dict(sorted(legend_info['divisions'].items()))
 
         return legend_info
 
@@ -649,16 +676,20 @@ class MapManagerBase(object):
         x2_minus_x1 = max_div - min_div
         m = y2_minus_y1 / x2_minus_x1
         b = max_val - (m * max_div)
-        for i in range(min_div, max_div + 1):
-            divisions[f'{prefix}{i}'] = f"{(m * i + b):.{value_precision}f}"
-
-            if color_ramp in self.COLOR_RAMPS.keys():
-                divisions[f'{color_prefix}{i}'] =\
-                    f"{self.COLOR_RAMPS[color_ramp][(i - first_division) % len(self.COLOR_RAMPS[color_ramp])]}"
-            else:
-                # use default color ramp
-                divisions[f'{color_prefix}{i}'] =\
-                    f"{self.COLOR_RAMPS['Default'][(i - first_division) % len(self.COLOR_RAMPS['Default'])]}"
+
+        # Fall back to the default color ramp for unknown names
+        ramp = self.COLOR_RAMPS[color_ramp] if color_ramp in self.COLOR_RAMPS else self.COLOR_RAMPS['Default']
+        ramp_len = len(ramp)
+
+        if num_divisions >= self._VECTORIZE_DIVISIONS_THRESHOLD:
+            # Compute values for large ramps in one vectorized pass
+            values = (np.arange(min_div, max_div + 1) * m + b).tolist()
+        else:
+            values = [m * i + b for i in range(min_div, max_div + 1)]
+
+        for i, value in enumerate(values, start=min_div):
+            divisions[f'{prefix}{i}'] = f"{value:.{value_precision}f}"
+            divisions[f'{color_prefix}{i}'] = f"{ramp[(i - first_division) % ramp_len]}"
         if no_data_value is not None:
             divisions['val_no_data'] = no_data_value
         return divisions
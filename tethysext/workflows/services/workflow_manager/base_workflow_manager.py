@@ -1,4 +1,5 @@
 import os
+import re
 import logging
 
 from tethys_compute.models import CondorWorkflowJobNode
@@ -6,10 +7,30 @@ from ...utilities import generate_geoserver_urls
 
 log = logging.getLogger(f'tethys.{__name__}')
 
+_JOB_TYPES = frozenset((dict, CondorWorkflowJobNode))
+
+
+def jobs_are_valid(jobs):
+    """
+    Check that every job is a CondorWorkflowJobNode or equivalent dictionary.
+
+    Args:
+        jobs(list<CondorWorkflowJobNode or dict>): List of jobs to check.
+
+    Returns:
+        bool: True if all jobs are valid.
+    """
+    # Exact type check covers the common case, subclasses fall through to isinstance (one pass, stops at first bad job)
+    return all(type(x) in _JOB_TYPES or isinstance(x, (dict, CondorWorkflowJobNode)) for x in jobs)
+
+
+# Matches characters that are not letters or digits (underscores are replaced with themselves)
+UNSAFE_JOB_NAME_CHARS = re.compile(r'\W')
+
 
 class BaseWorkflowManager(object):
     EXECUTABLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-                                         'job_scripts', 'workflow')
+                                  'job_scripts', 'workflow')
 
     def __init__(self, session, workflow_step, user, working_directory, app, scheduler_name=None,
                  jobs=None, job_script=None, input_files=None, gs_engine=None, *args):
@@ -26,9 +47,7 @@ class BaseWorkflowManager(object):
             jobs(list<CondorWorkflowJobNode or dict>): List of CondorWorkflowJobNodes to run.
             input_files(list<str>): List of paths to files to sends as inputs to every job. Optional.
         """  # noqa: E501
-        if not jobs or not all(isinstance(x, (dict, CondorWorkflowJobNode)) for x in jobs):
-            raise ValueError('Argument "jobs" is not defined or empty. Must provide at least one CondorWorkflowJobNode '
-                             'or equivalent dictionary.')
+        self.validate_jobs(jobs)
 
         # DB url for database for connection
         self.db_url = str(session.get_bind().url)
@@ -40,16 +59,17 @@ class BaseWorkflowManager(object):
             self.gs_private_url, self.gs_public_url = generate_geoserver_urls(gs_engine)
 
         # Important IDs
-        self.workflow_id = str(workflow_step.workflow.id)
-        self.workflow_name = workflow_step.workflow.name
-        self.workflow_type = workflow_step.workflow.DISPLAY_TYPE_SINGULAR
+        workflow = workflow_step.workflow
+        self.workflow_id = str(workflow.id)
+        self.workflow_name = workflow.name
+        self.workflow_type = workflow.DISPLAY_TYPE_SINGULAR
         self.workflow_step_id = str(workflow_step.id)
         self.workflow_step_name = workflow_step.name
 
         # Job Definition Variables
         self.jobs = jobs
         self.job_script = job_script
-        self.jobs_are_dicts = isinstance(jobs[0], dict)
+        self.jobs_are_dicts = isinstance(jobs, (list, tuple)) and isinstance(jobs[0], dict)
         self.user = user
         self.working_directory = working_directory
         self.app = app
@@ -61,7 +81,7 @@ class BaseWorkflowManager(object):
         self.custom_job_args = args
 
         #: Safe name with only A-Z 0-9
-        self.safe_job_name = ''.join(s if s.isalnum() else '_' for s in self.workflow_step_name)
+        self.safe_job_name = UNSAFE_JOB_NAME_CHARS.sub('_', self.workflow_step_name)
 
         # Prepare standard arguments for all jobs
         self.job_args = [
@@ -86,35 +106,54 @@ class BaseWorkflowManager(object):
         Create workspace if it doesn't exist.
         """
         # Create job directory if it doesn't exist already
-        if not os.path.exists(self.workspace):
-            os.makedirs(self.workspace)
+        os.makedirs(self.workspace_path, exist_ok=True)
 
         self.workspace_initialized = True
 
     @property
-    def workspace(self):
+    def workspace_path(self):
         """
-        Workspace path property.
+        Workspace path property. Does not create the workspace directory.
         Returns:
             str: Path to workspace for this workflow
         """
         if self._workspace_path is None:
             self._workspace_path = os.path.join(
                 self.working_directory,
-                str(self.workflow_id),
-                str(self.workflow_step_id),
+                self.workflow_id,
+                self.workflow_step_id,
                 self.safe_job_name
             )
 
-            # Initialize workspace
-            if not self.workspace_initialized:
-                self._initialize_workspace()
-
         return self._workspace_path
 
+    @property
+    def workspace(self):
+        """
+        Workspace path property. Creates the workspace directory on first access.
+        Returns:
+            str: Path to workspace for this workflow
+        """
+        # Initialize workspace
+        if not self.workspace_initialized:
+            self._initialize_workspace()
+
+        return self.workspace_path
+
     def prepare(self):
         raise NotImplementedError
 
+    def validate_jobs(self, jobs):
+        """
+        Validates that the jobs are defined (not empty) and are a CondorWorkflowJobNode or equivalent dictionary.
+
+        Args:
+            jobs(list<CondorWorkflowJobNode or dict>): List of CondorWorkflowJobNodes to run.
+        """
+        if not jobs or not jobs_are_valid(jobs):
+            raise ValueError('Argument "jobs" is not defined or empty. Must provide at least one CondorWorkflowJobNode '
+                             'or equivalent dictionary.')
+
     def run_job(self):
         """
         Prepares and executes the job.
@@ -126,6 +165,10 @@ class BaseWorkflowManager(object):
         if not self.prepared:
             self.prepare()
 
+        # Create the workspace before the job writes to it
+        if not self.workspace_initialized:
+            self._initialize_workspace()
+
         # Execute
         self.workflow.execute()
         return str(self.workflow.id)
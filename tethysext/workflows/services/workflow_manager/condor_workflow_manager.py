@@ -6,23 +6,32 @@
 * Copyright: (c) Aquaveo 2019
 ********************************************************************************
 """
-import inspect
 import logging
 import os
+from functools import lru_cache
 from tethys_sdk.jobs import CondorWorkflowJobNode
-from .base_workflow_manager import BaseWorkflowManager
-from ...utilities import generate_geoserver_urls
+from .base_workflow_manager import BaseWorkflowManager, jobs_are_valid
 from tethys_apps.exceptions import TethysAppSettingDoesNotExist
 
 log = logging.getLogger(f'tethys.{__name__}')
 
 
+@lru_cache(maxsize=256)
+def _class_dotpath(cls):
+    """
+    Derive the dot path of the given class.
+    """
+    module = cls.__module__
+    if module is None or module == str.__class__.__module__:
+        return cls.__name__  # Avoid reporting __builtin__
+    else:
+        return module + '.' + cls.__name__
+
+
 class WorkflowCondorJobManager(BaseWorkflowManager):
     """
     Helper class that prepares and submits condor workflows/jobs for workflows.
     """
-    EXECUTABLE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
-                                         'job_scripts', 'workflow')
 
     def __init__(self, session, workflow_step, user, working_directory, app, scheduler_name,
                  jobs=None, input_files=None, gs_engine=None,
@@ -42,107 +51,33 @@ class WorkflowCondorJobManager(BaseWorkflowManager):
             workflow(TethysWorkflow): The workflow.
             workflow_kwargs(dict): Optional keyword arguments to pass to the CondorWorkflow.
         """  # noqa: E501
-        self.validate_jobs(jobs)
-
-        # DB url for database connection 
-        self.db_url = str(session.get_bind().url)
-
-        # Serialize GeoServer Connection
-        self.gs_private_url = ''
-        self.gs_public_url = ''
-        if gs_engine is not None:
-            self.gs_private_url, self.gs_public_url = generate_geoserver_urls(gs_engine)
+        super().__init__(session, workflow_step, user, working_directory, app, scheduler_name, jobs, None,
+                         input_files, gs_engine, *args)
+        self.session = session
 
-        # Important IDs
+        # Important IDs (tethys_ prefixed names kept for backwards compatibility)
         self.tethys_workflow = workflow
-        self.tethys_workflow_id = str(workflow_step.workflow.id)
-        self.tethys_workflow_name = workflow_step.workflow.name
-        self.tethys_workflow_type = workflow_step.workflow.DISPLAY_TYPE_SINGULAR
-        self.tethys_workflow_step_id = str(workflow_step.id)
-        self.tethys_workflow_step_name = workflow_step.name
+        self.tethys_workflow_id = self.workflow_id
+        self.tethys_workflow_name = self.workflow_name
+        self.tethys_workflow_type = self.workflow_type
+        self.tethys_workflow_step_id = self.workflow_step_id
+        self.tethys_workflow_step_name = self.workflow_step_name
 
         # Get Path to Workflow Class
         self.tethys_workflow_class = self._get_class_path(workflow_step.workflow)
 
-        # Job Definition Variables
-        self.jobs = jobs
-        self.session = session
-        self.user = user
-        self.working_directory = working_directory
-        self.app = app
-        self.scheduler_name = scheduler_name
-        if input_files is None:
-            self.input_files = []
-        else:
-            self.input_files = input_files
-        self.custom_job_args = args
-
-        #: Safe name with only A-Z 0-9
-        self.safe_job_name = ''.join(s if s.isalnum() else '_' for s in self.tethys_workflow_step_name)
-
-        # Prepare standard arguments for all jobs
-        self.job_args = [
-            self.db_url,
-            self.tethys_workflow_id,
-            self.tethys_workflow_step_id,
-            self.gs_private_url,
-            self.gs_public_url,
-            self.tethys_workflow_class
-        ]
-
-        # Add custom args
-        self.job_args.extend(self.custom_job_args)
+        # Add workflow class after the standard arguments, before custom args
+        self.job_args.insert(len(self.job_args) - len(self.custom_job_args), self.tethys_workflow_class)
 
         # Add workflow kwargs
         self.workflow_kwargs = workflow_kwargs if workflow_kwargs is not None else {}
 
-        # State variables
-        self.workflow = None
-        self.prepared = False
-        self.workspace_initialized = False
-        self._workspace_path = None
-
-    @property
-    def workspace(self):
-        """
-        Workspace path property.
-        Returns:
-            str: Path to workspace for this workflow
-        """
-        if self._workspace_path is None:
-            self._workspace_path = os.path.join(
-                self.working_directory,
-                str(self.tethys_workflow_id),
-                str(self.tethys_workflow_step_id),
-                self.safe_job_name
-            )
-
-            # Initialize workspace
-            if not self.workspace_initialized:
-                self._initialize_workspace()
-
-        return self._workspace_path
-
-    def _initialize_workspace(self):
-        """
-        Create workspace if it doesn't exist.
-        """
-        # Create job directory if it doesn't exist already
-        if not os.path.exists(self.workspace):
-            os.makedirs(self.workspace)
-
-        self.workspace_initialized = True
-
     @staticmethod
     def _get_class_path(obj):
         """
         Derive the dot path of the class of a given object class.
         """
-        module = obj.__class__.__module__
-        if module is None or module == str.__class__.__module__:
-            return obj.__class__.__name__  # Avoid reporting __builtin__
-        else:
-            return module + '.' + obj.__class__.__name__
+        return _class_dotpath(type(obj))
 
     def prepare(self):
         """
@@ -159,14 +94,14 @@ class WorkflowCondorJobManager(BaseWorkflowManager):
         # Create Workflow
         self.workflow = job_manager.create_job(
             name=self.safe_job_name,
-            description='{}: {}'.format(self.tethys_workflow_type, self.tethys_workflow_step_name),
+            description='{}: {}'.format(self.workflow_type, self.workflow_step_name),
             job_type='CONDORWORKFLOW',
-            workspace=self.workspace,
+            workspace=self.workspace_path,
             user=self.user,
             scheduler=scheduler,
             extended_properties={
-                'workflow_id': self.tethys_workflow_id,
-                'workflow_step_id': self.tethys_workflow_step_id,
+                'workflow_id': self.workflow_id,
+                'workflow_step_id': self.workflow_step_id,
             },
             **self.workflow_kwargs,
         )
@@ -175,38 +110,38 @@ class WorkflowCondorJobManager(BaseWorkflowManager):
         self.workflow.save()
 
         # Preprocess jobs if they are dicts or a callback function
-        if inspect.isfunction(self.jobs):
+        if callable(self.jobs):
             cur_jobs = self.jobs(self)
             self.validate_jobs(cur_jobs)  # Validate again (needed if self.jobs was a callback function)
         else:
             cur_jobs = self.jobs
+        terminal_jobs = None
         if isinstance(cur_jobs[0], dict):
             # Jobs are dicts
-            cur_jobs = self._build_job_nodes(cur_jobs)
+            cur_jobs, terminal_jobs = self._build_job_nodes(cur_jobs)
         self.jobs = cur_jobs
 
         # Add file names as args
-        input_file_names = []
-        for input_file in self.input_files:
-            input_file_name = os.path.split(input_file)[1]
-            input_file_names.append(input_file_name)
-            self.job_args.append(input_file_name)
+        input_file_names = [os.path.basename(input_file) for input_file in self.input_files]
+        self.job_args.extend(input_file_names)
+
+        # Input files are transferred from the parent workflow directory
+        input_file_transfer_paths = ['../{}'.format(input_file_name) for input_file_name in input_file_names]
 
         # Parametrize each job
         for job in self.jobs:
-            # Set arguments for each job
+            # Set arguments for each job (jobs without their own share the standard list, like the finalize job)
             existing_job_args = job.get_attribute('arguments')
             if existing_job_args:
-                existing_job_args = existing_job_args.split()
-            current_job_args = self.job_args + (existing_job_args if existing_job_args else [])
+                current_job_args = self.job_args + existing_job_args.split()
+            else:
+                current_job_args = self.job_args
             job.set_attribute('arguments', current_job_args)
 
             # Add input files to transfer input files
-            transfer_input_files_str = job.get_attribute('transfer_input_files') or ''
-            transfer_input_files = transfer_input_files_str.split(',')
-
-            for input_file_name in input_file_names:
-                transfer_input_files.append('../{}'.format(input_file_name))
+            transfer_input_files_str = job.get_attribute('transfer_input_files')
+            transfer_input_files = transfer_input_files_str.split(',') if transfer_input_files_str else []
+            transfer_input_files.extend(input_file_transfer_paths)
 
             job.set_attribute('transfer_input_files', transfer_input_files)
 
@@ -235,9 +170,12 @@ class WorkflowCondorJobManager(BaseWorkflowManager):
         update_status_job.save()
 
         # Bind update_status job only to terminal nodes in the workflow (jobs without children)
-        for job in self.jobs:
-            if len(job.children_nodes.select_subclasses()) <= 0:
-                update_status_job.add_parent(job)
+        if terminal_jobs is None:
+            # Job nodes were given directly, so their children must be looked up
+            terminal_jobs = [job for job in self.jobs if len(job.children_nodes.select_subclasses()) <= 0]
+
+        for job in terminal_jobs:
+            update_status_job.add_parent(job)
 
         self.jobs.append(update_status_job)
 
@@ -256,7 +194,7 @@ class WorkflowCondorJobManager(BaseWorkflowManager):
             job_dicts(list<dicts>): A list of dictionaries, each containing the kwargs for a CondorWorkflowJobNode.
 
         Returns:
-            list<CondorWorkflowJobNodes>: the job nodes.
+            list<CondorWorkflowJobNodes>, list<CondorWorkflowJobNodes>: the job nodes and the terminal job nodes.
         """
         from tethys_sdk.jobs import CondorWorkflowJobNode
 
@@ -282,29 +220,17 @@ class WorkflowCondorJobManager(BaseWorkflowManager):
             # For mapping relationships
             job_map[job.name] = {'job': job, 'parents': parents}
 
-        # Set Parent Relationships
+        # Set Parent Relationships (saved by add_parent, jobs are saved again in prepare)
+        parent_names = set()
         for job in jobs:
             for parent_name in job_map[job.name]['parents']:
                 job.add_parent(job_map[parent_name]['job'])
+                parent_names.add(parent_name)
 
-            job.save()
-
-        return jobs
-
-    def run_job(self):
-        """
-        Prepares and executes the job.
-
-        Returns:
-            str: UUID of the CondorWorkflow.
-        """
-        # Prepare
-        if not self.prepared:
-            self.prepare()
+        # Jobs that are not a parent of any other job are the terminal nodes
+        terminal_jobs = [job for job in jobs if job.name not in parent_names]
 
-        # Execute
-        self.workflow.execute()
-        return str(self.workflow.id)
+        return jobs, terminal_jobs
 
     def validate_jobs(self, jobs):
         """
@@ -315,7 +241,7 @@ class WorkflowCondorJobManager(BaseWorkflowManager):
         """
         if (
             not jobs or
-            (not inspect.isfunction(jobs) and not all(isinstance(x, (dict, CondorWorkflowJobNode)) for x in jobs))
+            (not callable(jobs) and not jobs_are_valid(jobs))
         ):
             raise ValueError('Given "jobs" is not defined or empty. Must provide at least one '
                              'CondorWorkflowJobNode or equivalent dictionary.')
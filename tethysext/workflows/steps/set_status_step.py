@@ -61,14 +61,15 @@ class SetStatusStep(Step):
             RuntimeError: Invalid statuses or malformed status dictionaries.
         """
         valid_statuses = self.valid_statuses()
+        valid_statuses_set = set(valid_statuses)
 
         # Validate the statuses
         for status_dict in self.options.get('statuses', []):
-            if 'status' not in status_dict.keys():
+            if 'status' not in status_dict:
                 raise RuntimeError(f'Key "status" not found in status dict provided by option '
                                    f'"statuses": {status_dict}')
 
             status = status_dict['status']
-            if status not in valid_statuses:
+            if status not in valid_statuses_set:
                 raise RuntimeError(f'Status "{status}" is not a valid status for {self.__class__.__name__}. '
                                    f'Must be one of: {", ".join(valid_statuses)}')
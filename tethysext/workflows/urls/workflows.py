@@ -6,7 +6,7 @@
 * Copyright: (c) Aquaveo 2018
 ********************************************************************************
 """
-import inspect
+from functools import lru_cache
 from django.utils.text import slugify
 from ..controllers.workflows.workflow_router import WorkflowRouter
 from ..models import TethysWorkflow
@@ -18,6 +18,21 @@ DEFAULT_HANDLER = {
 }
 
 
+@lru_cache(maxsize=None)
+def _make_controller(router_class, controller_items):
+    """
+    Create a controller for the given WorkflowRouter class, reusing it for identical arguments.
+
+    Args:
+        router_class(WorkflowRouter): WorkflowRouter class.
+        controller_items(tuple): Sorted key-value pairs of the keyword arguments for as_controller.
+
+    Returns:
+        callable: the controller.
+    """
+    return router_class.as_controller(**dict(controller_items))
+
+
 def urls(url_map_maker, app, persistent_store_name, workflow_pairs, base_url_path='',
          custom_permissions_manager=None, base_template='workflows/base.html', handler=DEFAULT_HANDLER['handler'],
          handler_type=DEFAULT_HANDLER['type']):
@@ -56,15 +71,16 @@ def urls(url_map_maker, app, persistent_store_name, workflow_pairs, base_url_pat
         if base_url_path.endswith('/'):
             base_url_path = base_url_path[:-1]
 
+    url_prefix = f'{base_url_path}/' if base_url_path else ''
     url_maps = []
 
     for _TethysWorkflow, _WorkflowRouter in workflow_pairs:
-        if not _TethysWorkflow or not inspect.isclass(_TethysWorkflow) \
+        if not _TethysWorkflow or not isinstance(_TethysWorkflow, type) \
            or not issubclass(_TethysWorkflow, TethysWorkflow):
             raise ValueError('Must provide a valid TethysWorkflow model as the first item in the '
                              'workflow_pairs argument.')
 
-        if not _WorkflowRouter or not inspect.isclass(_WorkflowRouter) \
+        if not _WorkflowRouter or not isinstance(_WorkflowRouter, type) \
            or not issubclass(_WorkflowRouter, WorkflowRouter):
             raise ValueError('Must provide a valid WorkflowRouter controller as the second item in the '
                              'workflow_pairs argument.')
@@ -75,42 +91,38 @@ def urls(url_map_maker, app, persistent_store_name, workflow_pairs, base_url_pat
         workflow_step_result_name = '{}_workflow_step_result'.format(_TethysWorkflow.TYPE)
 
         # Url Patterns
-        workflow_url = slugged_name + '/{workflow_id}'  # noqa: E222, E501
-        workflow_step_url = slugged_name + '/{workflow_id}/step/{step_id}'  # noqa: E222, E501
-        workflow_step_result_url = slugged_name + '/{workflow_id}/step/{step_id}/result/{result_id}'  # noqa: E222, E501
+        workflow_url = url_prefix + slugged_name + '/{workflow_id}'  # noqa: E222, E501
+        workflow_step_url = workflow_url + '/step/{step_id}'  # noqa: E222, E501
+        workflow_step_result_url = workflow_step_url + '/result/{result_id}'  # noqa: E222, E501
+
+        # Controllers
+        controller_kwargs = {
+            '_app': app,
+            '_persistent_store_name': persistent_store_name,
+            'base_template': base_template,
+        }
+        workflow_step_result_controller = _make_controller(_WorkflowRouter, tuple(sorted(controller_kwargs.items())))
+        controller_kwargs['_TethysWorkflow'] = _TethysWorkflow
+        workflow_controller = _make_controller(_WorkflowRouter, tuple(sorted(controller_kwargs.items())))
 
         workflow_url_maps = [
             url_map_maker(
                 name=workflow_name,
-                url='/'.join([base_url_path, workflow_url]) if base_url_path else workflow_url,
-                controller=_WorkflowRouter.as_controller(
-                    _app=app,
-                    _persistent_store_name=persistent_store_name,
-                    _TethysWorkflow=_TethysWorkflow,
-                    base_template=base_template
-                )
+                url=workflow_url,
+                controller=workflow_controller
             ),
             url_map_maker(
                 name=workflow_step_name,
-                url='/'.join([base_url_path, workflow_step_url]) if base_url_path else workflow_step_url,
-                controller=_WorkflowRouter.as_controller(
-                    _app=app,
-                    _persistent_store_name=persistent_store_name,
-                    _TethysWorkflow=_TethysWorkflow,
-                    base_template=base_template
-                ),
+                url=workflow_step_url,
+                controller=workflow_controller,
                 handler=handler,
                 handler_type=handler_type,
                 regex=['[0-9A-Za-z-_.]+', '[0-9A-Za-z-_.{}]+', '[0-9A-Za-z-_.]+']
             ),
             url_map_maker(
                 name=workflow_step_result_name,
-                url='/'.join([base_url_path, workflow_step_result_url]) if base_url_path else workflow_step_result_url,
-                controller=_WorkflowRouter.as_controller(
-                    _app=app,
-                    _persistent_store_name=persistent_store_name,
-                    base_template=base_template
-                )
+                url=workflow_step_result_url,
+                controller=workflow_step_result_controller
             )
         ]
 